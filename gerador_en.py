@@ -13,6 +13,14 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, Frame, Label
 import concurrent.futures
 import subprocess
+import hashlib
+import sys
+import uuid
+import socket
+import sqlite3
+import argparse
+import contextlib
+import tempfile
 
 try:
     import docx
@@ -51,11 +59,30 @@ CTA_INTRO_MARKERS = [
     "Comment this right now",
     "Say it, write it, declare it",
 ]
+# Frases recorrentes do canal (CTAs, vinhetas) que o parser separa do corpo
+# para que virem unidades reutilizáveis na biblioteca de frases.
+BOILERPLATE_MARKERS = list(CTA_INTRO_MARKERS)
 CTA_MEIO_MARKER = "[CTA MEIO AQUI]"
 CTA_FINAL_MARKER = "[CTA FIM AQUI]"
 TMP_DIR = pathlib.Path("./tts_temp_en")
 TARGET_SR = 24000
 
+### MUDANÇA: Biblioteca de frases compartilhada entre roteiros ###
+PHRASE_LIBRARY_DIR = pathlib.Path("./phrase_library_en")
+PHRASE_LIBRARY_MAX_ENTRIES = 500
+# Só guarda uma frase a partir da segunda vez que ela aparece (em roteiros
+# diferentes); títulos numerados e CTAs com nomes nunca chegam a entrar.
+PHRASE_LIBRARY_MIN_SIGHTINGS = 2
+# Na remoção, cada uso vale como se a frase tivesse sido usada 7 dias depois
+PHRASE_LIBRARY_USE_BONUS_SECONDS = 7 * 24 * 3600
+REUSABLE_PART_TYPES = {"title", "cta", "boilerplate"}
+
+### MUDANÇA: Modo distribuído (coordenador + workers em várias máquinas) ###
+QUEUE_LEASE_SECONDS = 300
+QUEUE_POLL_INTERVAL = 2
+QUEUE_MAX_ATTEMPTS = 3
+QUEUE_RETRY_BACKOFF_SECONDS = 2  # Espera 2, 4 segundos... entre tentativas
+
 ### MUDANÇA: Reduzindo o número de workers para evitar sobrecarga na rede ###
 MAX_WORKERS = 4
 
@@ -83,6 +110,7 @@ def parse_script(
     cta_final: str,
     chapter_regex: str,
     cta_intro_markers: list,
+    boilerplate_markers: list = None,
 ) -> tuple[str, list]:
     content, _, _ = full_text.partition(cta_final)
     content = content.strip()
@@ -144,15 +172,88 @@ def parse_script(
             chapter_segment["parts"].append({"type": "body", "text": chapter_body_text})
         if chapter_segment["parts"]:
             final_segments.append(chapter_segment)
+    # Só a frase do CTA (e frases-padrão) vira unidade reutilizável;
+    # o texto específico do roteiro volta a ser corpo.
+    cta_markers = list(cta_intro_markers) + list(boilerplate_markers or [])
+    for segment in final_segments:
+        segment["parts"] = [
+            new_part
+            for part in segment["parts"]
+            for new_part in (
+                split_boilerplate(part["text"], cta_markers, "cta")
+                if part["type"] == "cta"
+                else split_boilerplate(part["text"], boilerplate_markers)
+                if part["type"] == "body" and boilerplate_markers
+                else [part]
+            )
+        ]
     return script_title, final_segments
 
 
+def split_boilerplate(text: str, markers: list, marker_type: str = "boilerplate") -> list:
+    sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+    parts, body_sentences = [], []
+    for sentence in sentences:
+        if any(re.search(re.escape(m), sentence, re.IGNORECASE) for m in markers):
+            if body_sentences:
+                parts.append({"type": "body", "text": " ".join(body_sentences)})
+                body_sentences = []
+            parts.append({"type": marker_type, "text": sentence.strip()})
+        elif sentence.strip():
+            body_sentences.append(sentence.strip())
+    if body_sentences:
+        parts.append({"type": "body", "text": " ".join(body_sentences)})
+    return parts
+
+
 def run_ffmpeg(command: list):
     subprocess.run(
         command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
     )
 
 
+def concat_wav_files(chunk_paths: list, output_path: pathlib.Path, work_dir: pathlib.Path):
+    if len(chunk_paths) == 1:
+        shutil.copy(chunk_paths[0], output_path)
+        return
+    concat_list_path = work_dir / f"concat_{output_path.stem}.txt"
+    with open(concat_list_path, "w", encoding="utf-8") as f:
+        for path in chunk_paths:
+            f.write(f"file '{pathlib.Path(path).resolve()}'\n")
+    ffmpeg_command = [
+        "ffmpeg",
+        "-y",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(concat_list_path),
+        "-c",
+        "copy",
+        str(output_path),
+    ]
+    run_ffmpeg(ffmpeg_command)
+    concat_list_path.unlink()
+
+
+def prepare_part(segment: dict, part: dict, i: int, j: int) -> tuple[str, str, str]:
+    normalized_text = normalize_and_clean_text(part["text"])
+    final_text = convert_numbers_to_words(normalized_text, NUM2WORDS_LANG)
+    safe_title = re.sub(r"[\s\W]+", "_", segment["title"]).lower()
+    part_type = part.get("type", "part")
+    filename = f"{i:02d}_{j:02d}_{safe_title}_{part_type}.wav"
+    return final_text, part_type, filename
+
+
+def load_script_text(filepath: str) -> str:
+    if filepath.lower().endswith(".docx"):
+        doc = docx.Document(filepath)
+        return "\n".join([p.text for p in doc.paragraphs])
+    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
 def split_into_chunks(text: str, max_chars: int = 4800):
     if len(text) < max_chars:
         return [text]
@@ -196,6 +297,152 @@ def generate_audio_for_chunk(text: str, output_path: pathlib.Path, max_retries=3
             time.sleep(2 * (attempt + 1))  # Espera 2, 4 segundos...
 
 
+@contextlib.contextmanager
+def sqlite_transaction(db_path: pathlib.Path):
+    # BEGIN IMMEDIATE serializa escritores de processos diferentes
+    conn = sqlite3.connect(str(db_path), timeout=60, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+
+### MUDANÇA: Áudios de frases recorrentes são guardados e reaproveitados entre roteiros ###
+class PhraseLibrary:
+    def __init__(self, root_dir: pathlib.Path, max_entries: int):
+        self.root_dir = root_dir
+        self.max_entries = max_entries
+        self.index_path = root_dir / "index.db"
+        self.initialized = False
+
+    @staticmethod
+    def make_key(text: str, voice: str) -> str:
+        normalized = re.sub(r"\s+", " ", text).strip()
+        return hashlib.sha1(
+            f"{voice}|{TARGET_SR}|{normalized}".encode("utf-8")
+        ).hexdigest()
+
+    def _transaction(self):
+        if not self.initialized:
+            self.root_dir.mkdir(exist_ok=True, parents=True)
+            with sqlite_transaction(self.index_path) as conn:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS phrases (
+                        key TEXT PRIMARY KEY,
+                        file TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        voice TEXT NOT NULL,
+                        uses INTEGER NOT NULL DEFAULT 0,
+                        last_used REAL NOT NULL
+                    )"""
+                )
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS sightings (
+                        key TEXT PRIMARY KEY,
+                        seen INTEGER NOT NULL DEFAULT 0,
+                        last_seen REAL NOT NULL
+                    )"""
+                )
+            self.initialized = True
+        return sqlite_transaction(self.index_path)
+
+    def fetch(self, text: str, voice: str, output_path: pathlib.Path) -> bool:
+        key = self.make_key(text, voice)
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT file FROM phrases WHERE key = ?", (key,)
+            ).fetchone()
+            if row and not (self.root_dir / row[0]).exists():
+                conn.execute("DELETE FROM phrases WHERE key = ?", (key,))
+                row = None
+            if not row:
+                self._record_sighting(conn, key)
+                return False
+            shutil.copy(self.root_dir / row[0], output_path)
+            conn.execute(
+                "UPDATE phrases SET uses = uses + 1, last_used = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            return True
+
+    def record_uses(self, text: str, voice: str, count: int):
+        # Cópias dentro do mesmo roteiro também contam como uso
+        if count <= 0:
+            return
+        key = self.make_key(text, voice)
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE phrases SET uses = uses + ? WHERE key = ?", (count, key)
+            )
+
+    def store(self, text: str, voice: str, audio_path: pathlib.Path) -> bool:
+        key = self.make_key(text, voice)
+        filename = f"{key}.wav"
+        with self._transaction() as conn:
+            stored = conn.execute(
+                "SELECT 1 FROM phrases WHERE key = ?", (key,)
+            ).fetchone()
+            sighting = conn.execute(
+                "SELECT seen FROM sightings WHERE key = ?", (key,)
+            ).fetchone()
+            # Regenerar uma frase já guardada sempre substitui o áudio
+            if not stored and (sighting[0] if sighting else 0) < PHRASE_LIBRARY_MIN_SIGHTINGS:
+                return False
+            tmp_path = self.root_dir / f"{key}.{os.getpid()}.tmp"
+            shutil.copy(audio_path, tmp_path)
+            os.replace(tmp_path, self.root_dir / filename)
+            conn.execute(
+                """INSERT INTO phrases (key, file, text, voice, uses, last_used)
+                VALUES (?, ?, ?, ?, 1, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    uses = uses + 1, last_used = excluded.last_used""",
+                (key, filename, re.sub(r"\s+", " ", text).strip(), voice, time.time()),
+            )
+            conn.execute("DELETE FROM sightings WHERE key = ?", (key,))
+            self._evict(conn, key)
+            return True
+
+    def _record_sighting(self, conn, key: str):
+        conn.execute(
+            """INSERT INTO sightings (key, seen, last_seen) VALUES (?, 1, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                seen = seen + 1, last_seen = excluded.last_seen""",
+            (key, time.time()),
+        )
+        # Mantém só as aparições mais recentes para a tabela não crescer sem fim
+        conn.execute(
+            """DELETE FROM sightings WHERE key NOT IN (
+                SELECT key FROM sightings ORDER BY last_seen DESC LIMIT ?
+            )""",
+            (self.max_entries * 10,),
+        )
+
+    def _evict(self, conn, keep_key: str):
+        # Remove primeiro as frases menos usadas recentemente; cada uso adia a
+        # remoção, mas frases antigas acabam saindo mesmo com muitos usos.
+        # A recém-gravada nunca é candidata.
+        victims = conn.execute(
+            """SELECT key, file FROM phrases WHERE key != ?
+            ORDER BY last_used + uses * ? LIMIT MAX(
+                (SELECT COUNT(*) FROM phrases) - ?, 0
+            )""",
+            (keep_key, PHRASE_LIBRARY_USE_BONUS_SECONDS, self.max_entries),
+        ).fetchall()
+        for key, filename in victims:
+            conn.execute("DELETE FROM phrases WHERE key = ?", (key,))
+            with contextlib.suppress(OSError):
+                (self.root_dir / filename).unlink()
+
+
+PHRASE_LIBRARY = PhraseLibrary(PHRASE_LIBRARY_DIR, PHRASE_LIBRARY_MAX_ENTRIES)
+
+
 def safe_rmtree(path, max_retries=5, delay=0.2):
     for _ in range(max_retries):
         try:
@@ -206,6 +453,451 @@ def safe_rmtree(path, max_retries=5, delay=0.2):
     shutil.rmtree(path)
 
 
+# ==============================================================================
+# DISTRIBUTED MODE (COORDINATOR / WORKERS)
+# ==============================================================================
+# O coordenador publica os chunks numa fila SQLite em disco compartilhado;
+# workers em qualquer máquina reservam tarefas (lease + heartbeat), sintetizam
+# e gravam o WAV ao lado da fila. O coordenador monta e finaliza os áudios.
+#
+# Requisitos do disco compartilhado: a fila depende do lock de arquivo do
+# SQLite, que NÃO é confiável em NFS/SMB (pode haver reserva dupla ou banco
+# corrompido). Use um sistema de arquivos com locks POSIX funcionais.
+# Os leases não comparam relógios entre máquinas: cada heartbeat incrementa
+# um contador, e quem observa a fila só considera o lease expirado depois de
+# ver o contador parado por lease_seconds no seu próprio relógio monotônico.
+class ChunkQueue:
+    def __init__(self, db_path: pathlib.Path):
+        self.db_path = pathlib.Path(db_path)
+        self.root_dir = self.db_path.parent
+        self.root_dir.mkdir(exist_ok=True, parents=True)
+        # task_id -> (heartbeat_seq, instante local em que esse valor foi visto)
+        self.lease_observations = {}
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    part_key TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    result_path TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_seconds INTEGER,
+                    heartbeat_seq INTEGER NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL DEFAULT 0,
+                    error TEXT
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, id)"
+            )
+
+    def _connect(self):
+        return sqlite_transaction(self.db_path)
+
+    def _release_expired(self, conn):
+        now = time.monotonic()
+        leased = conn.execute(
+            "SELECT id, heartbeat_seq, lease_seconds FROM tasks WHERE status = 'leased'"
+        ).fetchall()
+        observations = {}
+        for task_id, seq, lease_seconds in leased:
+            seen_seq, seen_at = self.lease_observations.get(task_id, (None, now))
+            if seen_seq != seq:
+                observations[task_id] = (seq, now)
+                continue
+            if now - seen_at <= lease_seconds:
+                observations[task_id] = (seen_seq, seen_at)
+                continue
+            conn.execute(
+                """UPDATE tasks SET
+                    status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    error = 'Lease expired (worker stopped sending heartbeats)',
+                    worker = NULL
+                WHERE id = ? AND status = 'leased' AND heartbeat_seq = ?""",
+                (QUEUE_MAX_ATTEMPTS, task_id, seq),
+            )
+        self.lease_observations = observations
+
+    def resolve(self, result_path: str) -> pathlib.Path:
+        return self.root_dir / result_path
+
+    def publish(self, job_id: str, tasks: list):
+        with self._connect() as conn:
+            conn.executemany(
+                """INSERT INTO tasks (job_id, part_key, chunk_index, text, result_path)
+                VALUES (?, ?, ?, ?, ?)""",
+                [
+                    (job_id, t["part_key"], t["chunk_index"], t["text"], t["result_path"])
+                    for t in tasks
+                ],
+            )
+
+    def claim(self, worker_id: str, lease_seconds: int, job_id: str = None):
+        with self._connect() as conn:
+            self._release_expired(conn)
+            row = conn.execute(
+                """SELECT id, job_id, text, result_path FROM tasks
+                WHERE status = 'pending' AND available_at <= ?
+                AND (? IS NULL OR job_id = ?)
+                ORDER BY id LIMIT 1""",
+                (time.time(), job_id, job_id),
+            ).fetchone()
+            if not row:
+                return None
+            conn.execute(
+                """UPDATE tasks SET status = 'leased', worker = ?, lease_seconds = ?,
+                heartbeat_seq = heartbeat_seq + 1, attempts = attempts + 1
+                WHERE id = ?""",
+                (worker_id, lease_seconds, row[0]),
+            )
+        return {"id": row[0], "job_id": row[1], "text": row[2], "result_path": row[3]}
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """UPDATE tasks SET heartbeat_seq = heartbeat_seq + 1
+                WHERE id = ? AND worker = ? AND status = 'leased'""",
+                (task_id, worker_id),
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, task_id: int, worker_id: str):
+        # O arquivo gravado é válido mesmo se o lease expirou nesse meio tempo
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE tasks SET status = 'done', worker = ?, error = NULL
+                WHERE id = ? AND status != 'done'""",
+                (worker_id, task_id),
+            )
+
+    def fail(self, task_id: int, worker_id: str, error: str):
+        # A tarefa só volta a ser reservada depois de uma espera crescente,
+        # como as retentativas de generate_audio_for_chunk (útil para 429/503)
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE tasks SET
+                    status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    available_at = ? + attempts * ?,
+                    error = ?, worker = NULL
+                WHERE id = ? AND worker = ? AND status = 'leased'""",
+                (
+                    QUEUE_MAX_ATTEMPTS,
+                    time.time(),
+                    QUEUE_RETRY_BACKOFF_SECONDS,
+                    error,
+                    task_id,
+                    worker_id,
+                ),
+            )
+
+    def job_status(self, job_id: str) -> dict:
+        with self._connect() as conn:
+            self._release_expired(conn)
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status",
+                (job_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def job_tasks(self, job_id: str) -> list:
+        with self._connect() as conn:
+            rows = conn.execute(
+                """SELECT part_key, chunk_index, result_path, status, error
+                FROM tasks WHERE job_id = ? ORDER BY part_key, chunk_index""",
+                (job_id,),
+            ).fetchall()
+        keys = ["part_key", "chunk_index", "result_path", "status", "error"]
+        return [dict(zip(keys, row)) for row in rows]
+
+    def has_open_tasks(self, job_id: str = None) -> bool:
+        with self._connect() as conn:
+            self._release_expired(conn)
+            row = conn.execute(
+                """SELECT 1 FROM tasks WHERE status IN ('pending', 'leased')
+                AND (? IS NULL OR job_id = ?) LIMIT 1""",
+                (job_id, job_id),
+            ).fetchone()
+        return row is not None
+
+    def purge(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM tasks WHERE job_id = ?", (job_id,))
+
+
+def run_worker(
+    queue_path: str,
+    worker_id: str = None,
+    lease_seconds: int = QUEUE_LEASE_SECONDS,
+    poll_interval: float = QUEUE_POLL_INTERVAL,
+    exit_when_idle: bool = False,
+    job_id: str = None,
+):
+    queue = ChunkQueue(queue_path)
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    print(f"[{worker_id}] Waiting for tasks in {queue.db_path}...")
+    while True:
+        task = queue.claim(worker_id, lease_seconds, job_id)
+        if not task:
+            if exit_when_idle and not queue.has_open_tasks(job_id):
+                return
+            time.sleep(poll_interval)
+            continue
+        stop_heartbeat = threading.Event()
+
+        def send_heartbeats(task_id=task["id"]):
+            while not stop_heartbeat.wait(lease_seconds / 3):
+                # Um heartbeat perdido (ex.: "database is locked") não pode
+                # encerrar a thread, senão o lease expira no meio da síntese
+                try:
+                    queue.heartbeat(task_id, worker_id)
+                except Exception as e:
+                    print(f"[{worker_id}] Heartbeat failed for task {task_id}: {e}")
+
+        heartbeat_thread = threading.Thread(target=send_heartbeats, daemon=True)
+        heartbeat_thread.start()
+        output_path = queue.resolve(task["result_path"])
+        partial_path = output_path.with_suffix(f".{worker_id}.part")
+        try:
+            output_path.parent.mkdir(exist_ok=True, parents=True)
+            # As retentativas ficam a cargo da fila (QUEUE_MAX_ATTEMPTS)
+            generate_audio_for_chunk(task["text"], partial_path, max_retries=1)
+            os.replace(partial_path, output_path)
+            queue.complete(task["id"], worker_id)
+            print(f"[{worker_id}] Done: {task['result_path']}")
+        except Exception as e:
+            queue.fail(task["id"], worker_id, str(e))
+            print(f"[{worker_id}] Failure in {task['result_path']}: {e}")
+            with contextlib.suppress(OSError):
+                partial_path.unlink()
+        finally:
+            stop_heartbeat.set()
+            heartbeat_thread.join()
+
+
+def spawn_local_workers(queue_path: str, count: int, job_id: str) -> list:
+    if getattr(sys, "frozen", False):
+        base_command = [sys.executable]
+    else:
+        base_command = [sys.executable, os.path.abspath(__file__)]
+    return [
+        subprocess.Popen(
+            base_command
+            + ["worker", "--queue", str(queue_path), "--job", job_id, "--exit-when-idle"]
+        )
+        for _ in range(count)
+    ]
+
+
+def run_coordinator(
+    script_path: str,
+    queue_path: str,
+    output_dir: str,
+    local_workers: int = 0,
+    poll_interval: float = QUEUE_POLL_INTERVAL,
+):
+    queue = ChunkQueue(queue_path)
+    job_id = uuid.uuid4().hex[:12]
+    job_dir = f"jobs/{job_id}"
+    # Pasta temporária fora de TMP_DIR: a GUI apaga TMP_DIR inteira ao finalizar
+    job_tmp_dir = pathlib.Path(tempfile.mkdtemp(prefix=f"tts_job_{job_id}_"))
+    workers = []
+    try:
+        script_title, script_parts = parse_script(
+            load_script_text(script_path),
+            CTA_MEIO_MARKER,
+            CTA_FINAL_MARKER,
+            CHAPTER_MARKERS_REGEX,
+            CTA_INTRO_MARKERS,
+            BOILERPLATE_MARKERS,
+        )
+        parts, chunk_tasks, leaders = [], [], {}
+        for i, segment in enumerate(script_parts):
+            for j, part in enumerate(segment.get("parts", [])):
+                final_text, part_type, filename = prepare_part(segment, part, i, j)
+                if not final_text.strip():
+                    continue
+                part_info = {
+                    "key": f"{i:02d}_{j:02d}",
+                    "text": final_text,
+                    "type": part_type,
+                    "filename": filename,
+                    "path": job_tmp_dir / filename,
+                    "cached": False,
+                    "copies": [],
+                }
+                # Frases repetidas no mesmo roteiro são publicadas uma única vez
+                if part_type in REUSABLE_PART_TYPES:
+                    library_key = PhraseLibrary.make_key(final_text, VOICE_NAME)
+                    if library_key in leaders:
+                        leaders[library_key]["copies"].append(part_info)
+                        continue
+                    leaders[library_key] = part_info
+                if part_type in REUSABLE_PART_TYPES and PHRASE_LIBRARY.fetch(
+                    final_text, VOICE_NAME, part_info["path"]
+                ):
+                    part_info["cached"] = True
+                else:
+                    for idx, chunk in enumerate(split_into_chunks(final_text)):
+                        if chunk.strip():
+                            chunk_tasks.append(
+                                {
+                                    "part_key": part_info["key"],
+                                    "chunk_index": idx,
+                                    "text": chunk,
+                                    "result_path": f"{job_dir}/{part_info['key']}_chunk_{idx:03d}.wav",
+                                }
+                            )
+                parts.append(part_info)
+        if not parts:
+            print("❌ Error: No valid text segments were found.")
+            return 1
+        queue.publish(job_id, chunk_tasks)
+        print(
+            f"Job {job_id}: {len(chunk_tasks)} chunk(s) published, "
+            f"{sum(p['cached'] for p in parts)} part(s) reused from the phrase library, "
+            f"{sum(len(p['copies']) for p in parts)} repeated part(s) copied."
+        )
+        workers = spawn_local_workers(queue_path, local_workers, job_id)
+
+        start_time = time.time()
+        total = len(chunk_tasks)
+        while True:
+            status = queue.job_status(job_id)
+            finished = status.get("done", 0) + status.get("failed", 0)
+            print(
+                f"Generating audio {finished}/{total} "
+                f"({time.time() - start_time:.0f}s elapsed)...",
+                end="\r",
+            )
+            if finished >= total:
+                break
+            if (
+                workers
+                and all(worker.poll() is not None for worker in workers)
+                and queue.has_open_tasks(job_id)
+            ):
+                print()
+                print("❌ Error: All local workers exited before the job finished.")
+                return 1
+            time.sleep(poll_interval)
+        print()
+
+        error_log = []
+        chunks_by_part = {}
+        for task in queue.job_tasks(job_id):
+            chunks_by_part.setdefault(task["part_key"], []).append(task)
+        assembled = []
+        for part_info in parts:
+            if not part_info["cached"]:
+                chunks = chunks_by_part.get(part_info["key"], [])
+                failed = [c for c in chunks if c["status"] != "done"]
+                if failed or not chunks:
+                    error_log.extend(
+                        f"- Failure in '{p['filename']}': "
+                        f"{failed[0]['error'] if failed else 'no audio generated'}"
+                        for p in [part_info] + part_info["copies"]
+                    )
+                    continue
+                concat_wav_files(
+                    [queue.resolve(c["result_path"]) for c in chunks],
+                    part_info["path"],
+                    job_tmp_dir,
+                )
+                if part_info["type"] in REUSABLE_PART_TYPES:
+                    PHRASE_LIBRARY.store(part_info["text"], VOICE_NAME, part_info["path"])
+            assembled.append(part_info)
+            for copy_info in part_info["copies"]:
+                shutil.copy(part_info["path"], copy_info["path"])
+                assembled.append(copy_info)
+            if part_info["copies"]:
+                PHRASE_LIBRARY.record_uses(
+                    part_info["text"], VOICE_NAME, len(part_info["copies"])
+                )
+        assembled.sort(key=lambda p: p["filename"])
+
+        output_root = pathlib.Path(output_dir)
+        safe_title = re.sub(r"[^\w\-_\. ]", "_", script_title)
+        individual_dir = output_root / f"{safe_title}_individual_audios"
+        individual_dir.mkdir(exist_ok=True, parents=True)
+        for part_info in assembled:
+            shutil.copy(part_info["path"], individual_dir / part_info["filename"])
+        if error_log:
+            # Sem áudio final com lacunas: só os áudios individuais são salvos
+            print("The following errors occurred:\n\n" + "\n".join(error_log))
+            print(
+                "The master audio was NOT created. Individual audios were saved in:\n"
+                f"{individual_dir.resolve()}"
+            )
+            return 1
+        concat_wav_files(
+            [p["path"] for p in assembled],
+            output_root / f"{safe_title}_final_en.wav",
+            job_tmp_dir,
+        )
+        print(f"🎉 Audios saved successfully in:\n{output_root.resolve()}")
+        return 0
+    finally:
+        # Interrompido ou não: encerra os workers locais e limpa o job
+        for worker in workers:
+            if worker.poll() is None:
+                worker.terminate()
+        for worker in workers:
+            worker.wait()
+        queue.purge(job_id)
+        if queue.resolve(job_dir).exists():
+            safe_rmtree(queue.resolve(job_dir))
+        safe_rmtree(job_tmp_dir)
+
+
+QUEUE_HELP = (
+    "SQLite queue file on shared storage; needs working POSIX file locks "
+    "(not NFS/SMB)"
+)
+
+
+def main_cli(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="English Audio Generator")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+    coordinator_parser = subparsers.add_parser(
+        "coordinator", help="Parse a script, publish chunks and assemble the result"
+    )
+    coordinator_parser.add_argument("script")
+    coordinator_parser.add_argument("--queue", required=True, help=QUEUE_HELP)
+    coordinator_parser.add_argument("--output", required=True)
+    coordinator_parser.add_argument("--local-workers", type=int, default=0)
+    worker_parser = subparsers.add_parser(
+        "worker", help="Claim chunk tasks from the queue and synthesize them"
+    )
+    worker_parser.add_argument("--queue", required=True, help=QUEUE_HELP)
+    worker_parser.add_argument("--worker-id")
+    worker_parser.add_argument("--api-key")
+    worker_parser.add_argument(
+        "--lease-seconds", type=int, default=QUEUE_LEASE_SECONDS
+    )
+    worker_parser.add_argument("--job", help="Only claim tasks from this job")
+    worker_parser.add_argument("--exit-when-idle", action="store_true")
+    args = parser.parse_args(argv)
+    if args.mode == "coordinator":
+        return run_coordinator(
+            args.script, args.queue, args.output, args.local_workers
+        )
+    if args.api_key:
+        global GOOGLE_API_KEY
+        GOOGLE_API_KEY = args.api_key
+    run_worker(
+        args.queue,
+        args.worker_id,
+        args.lease_seconds,
+        exit_when_idle=args.exit_when_idle,
+        job_id=args.job,
+    )
+    return 0
+
+
 # ==============================================================================
 # GUI APPLICATION CLASS
 # ==============================================================================
@@ -312,18 +1004,14 @@ class AudioGeneratorApp:
         start_time = time.time()
         try:
             TMP_DIR.mkdir(exist_ok=True, parents=True)
-            if filepath.lower().endswith(".docx"):
-                doc = docx.Document(filepath)
-                full_text = "\n".join([p.text for p in doc.paragraphs])
-            else:
-                with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                    full_text = f.read()
+            full_text = load_script_text(filepath)
             self.script_title, script_parts = parse_script(
                 full_text,
                 CTA_MEIO_MARKER,
                 CTA_FINAL_MARKER,
                 CHAPTER_MARKERS_REGEX,
                 CTA_INTRO_MARKERS,
+                BOILERPLATE_MARKERS,
             )
             tasks = [
                 {"segment": segment, "part": part, "i": i, "j": j}
@@ -343,17 +1031,32 @@ class AudioGeneratorApp:
                 )
                 self.root.after(0, lambda: self.btn_select.config(state=tk.NORMAL))
                 return
+            # Frases repetidas no mesmo roteiro são sintetizadas uma única vez
+            unique_tasks, leaders = [], {}
+            for task in tasks:
+                final_text, part_type, _ = prepare_part(
+                    task["segment"], task["part"], task["i"], task["j"]
+                )
+                task["copies"] = []
+                if part_type in REUSABLE_PART_TYPES and final_text.strip():
+                    key = PhraseLibrary.make_key(final_text, VOICE_NAME)
+                    if key in leaders:
+                        leaders[key]["copies"].append(task)
+                        continue
+                    leaders[key] = task
+                unique_tasks.append(task)
             with concurrent.futures.ThreadPoolExecutor(
                 max_workers=MAX_WORKERS
             ) as executor:
                 future_to_task = {
                     executor.submit(self.worker_generate_audio, task): task
-                    for task in tasks
+                    for task in unique_tasks
                 }
                 completed_count = 0
                 total_tasks = len(tasks)
                 for future in concurrent.futures.as_completed(future_to_task):
-                    completed_count += 1
+                    task = future_to_task[future]
+                    completed_count += 1 + len(task["copies"])
                     self.root.after(
                         0,
                         self.update_progress,
@@ -361,15 +1064,19 @@ class AudioGeneratorApp:
                         total_tasks,
                         start_time,
                     )
-                    task = future_to_task[future]
-                    try:
-                        segment_info = future.result()
-                        if segment_info:
-                            self.generated_segments_data.append(segment_info)
-                    except Exception as exc:
-                        self.error_log.append(
-                            f"- Failure in '{task['segment']['title']}': {exc}"
-                        )
+                    for current in [task] + task["copies"]:
+                        try:
+                            segment_info = future.result()
+                            if segment_info and current is not task:
+                                segment_info = self.copy_segment_audio(
+                                    segment_info, current
+                                )
+                            if segment_info:
+                                self.generated_segments_data.append(segment_info)
+                        except Exception as exc:
+                            self.error_log.append(
+                                f"- Failure in '{current['segment']['title']}': {exc}"
+                            )
             self.generated_segments_data.sort(key=lambda s: s["filename"])
             self.root.after(0, self.redraw_ui_list)
             if self.error_log:
@@ -406,48 +1113,34 @@ class AudioGeneratorApp:
 
     def worker_generate_audio(self, task):
         segment, part, i, j = task["segment"], task["part"], task["i"], task["j"]
-        normalized_text = normalize_and_clean_text(part["text"])
-        final_text = convert_numbers_to_words(normalized_text, NUM2WORDS_LANG)
+        final_text, part_type, filename = prepare_part(segment, part, i, j)
         if not final_text.strip():
             return None
-        text_chunks = split_into_chunks(final_text)
-        chunk_paths = []
-        temp_chunk_dir = TMP_DIR / f"chunks_{i}_{j}"
-        temp_chunk_dir.mkdir(exist_ok=True)
-        for idx, chunk in enumerate(text_chunks):
-            if not chunk.strip():
-                continue
-            chunk_path = temp_chunk_dir / f"chunk_{idx}.wav"
-            generate_audio_for_chunk(chunk, chunk_path)
-            chunk_paths.append(chunk_path)
-        if not chunk_paths:
-            return None
-        safe_title = re.sub(r"[\s\W]+", "_", segment["title"]).lower()
-        part_type = part.get("type", "part")
-        filename = f"{i:02d}_{j:02d}_{safe_title}_{part_type}.wav"
         output_path = TMP_DIR / filename
-        if len(chunk_paths) == 1:
-            shutil.move(chunk_paths[0], output_path)
-        else:
-            concat_list_path = temp_chunk_dir / "concat_list.txt"
-            with open(concat_list_path, "w", encoding="utf-8") as f:
-                for path in chunk_paths:
-                    f.write(f"file '{path.resolve()}'\n")
-            ffmpeg_command = [
-                "ffmpeg",
-                "-y",
-                "-f",
-                "concat",
-                "-safe",
-                "0",
-                "-i",
-                str(concat_list_path),
-                "-c",
-                "copy",
-                str(output_path),
-            ]
-            run_ffmpeg(ffmpeg_command)
-        safe_rmtree(temp_chunk_dir)
+        # Regenerar ignora a biblioteca e substitui o áudio guardado
+        reusable = part_type in REUSABLE_PART_TYPES
+        if not (
+            reusable
+            and not task.get("regenerate")
+            and PHRASE_LIBRARY.fetch(final_text, VOICE_NAME, output_path)
+        ):
+            text_chunks = split_into_chunks(final_text)
+            chunk_paths = []
+            temp_chunk_dir = TMP_DIR / f"chunks_{i}_{j}"
+            temp_chunk_dir.mkdir(exist_ok=True)
+            for idx, chunk in enumerate(text_chunks):
+                if not chunk.strip():
+                    continue
+                chunk_path = temp_chunk_dir / f"chunk_{idx}.wav"
+                generate_audio_for_chunk(chunk, chunk_path)
+                chunk_paths.append(chunk_path)
+            if not chunk_paths:
+                safe_rmtree(temp_chunk_dir)
+                return None
+            concat_wav_files(chunk_paths, output_path, temp_chunk_dir)
+            safe_rmtree(temp_chunk_dir)
+            if reusable:
+                PHRASE_LIBRARY.store(final_text, VOICE_NAME, output_path)
         with AudioFileClip(str(output_path)) as clip:
             duration = clip.duration
         return {
@@ -460,6 +1153,22 @@ class AudioGeneratorApp:
             "approved": tk.BooleanVar(value=True),
         }
 
+    def copy_segment_audio(self, source_info, task):
+        _, part_type, filename = prepare_part(
+            task["segment"], task["part"], task["i"], task["j"]
+        )
+        output_path = TMP_DIR / filename
+        shutil.copy(source_info["path"], output_path)
+        PHRASE_LIBRARY.record_uses(source_info["text"], VOICE_NAME, 1)
+        return {
+            **source_info,
+            "title": task["segment"]["title"],
+            "type": part_type,
+            "path": output_path,
+            "filename": filename,
+            "approved": tk.BooleanVar(value=True),
+        }
+
     def redraw_ui_list(self):
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
@@ -553,6 +1262,7 @@ class AudioGeneratorApp:
                 "part": {"text": segment_info["text"], "type": segment_info["type"]},
                 "i": task_i,
                 "j": task_j,
+                "regenerate": True,
             }
             new_info = self.worker_generate_audio(original_task)
             if new_info:
@@ -672,6 +1382,8 @@ class AudioGeneratorApp:
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in ("coordinator", "worker"):
+        sys.exit(main_cli(sys.argv[1:]))
     root = ttk.Window(themename="flatly")
     app = AudioGeneratorApp(root)
     root.mainloop()